@@ -1,164 +1,369 @@
 import gradio as gr
-import pandas as pd
-import matplotlib.pyplot as plt
-import requests
+import numpy as np
+import aiohttp
+import asyncio
+import atexit
 from datetime import datetime, timedelta
-import json
+import orjson
 import os
-import xml.etree.ElementTree as ET
+import threading
+import time
+from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import io
+from lxml import etree
 
 # --- CONFIGURATION ---
-CACHE_FILE = "rate_cache.json"
+CACHE_FILE = "rate_cache.json"  # metadata sidecar (timestamp, current rate)
+CACHE_DATA_FILE = "rate_cache.feather"  # Date/Rate series
+
+# Upstream endpoints
+BOI_URL = "https://www.boi.org.il/PublicApi/GetExchangeRates"
+HOST_LATEST_URL = "https://api.exchangerate.host/latest?base=USD&symbols=ILS"
+ER_API_URL = "https://open.er-api.com/v6/latest/USD"
+HIST_URL = "https://api.exchangerate.host/timeseries?start_date={s}&end_date={e}&base=USD&symbols=ILS"
+
+TODAY_TTL = 60  # seconds between re-reading the clock for today's date
+_TODAY = (0.0, None)  # (valid until, ISO date string)
+
+# Shared HTTP connection pool (keep-alive across refreshes)
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 8
+RETRY_TOTAL = 2
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = {429, 502, 503, 504}
+
+SESSION = None
+_SESSION_LOOP = None
+_SESSION_KEEPER = None
+
+# In-process TTL cache (seconds): fresh = served without refetch, stale = fallback on failure
+CURRENT_RATE_TTL = 30
+HISTORICAL_TTL = 3600
+STALE_TTL = 24 * 3600
+
+# Disk cache writes happen off the request path
+EXECUTOR = ThreadPoolExecutor(max_workers=1)
+
+_TTL_CACHE = {}
+_TTL_LOCK = threading.Lock()
+
+# Conditional GET validators per endpoint: {key: (url, etag, last_modified, parsed payload)}
+# One entry per endpoint, so dated URLs (timeseries) replace rather than accumulate
+_VALIDATORS = {}
+
+@dataclass
+class RateSeries:
+    """USD/ILS time series stored column-wise (one ndarray per column)"""
+    date: np.ndarray  # datetime64[D]
+    rate: np.ndarray  # float64
+    sma7: np.ndarray = None  # filled in by calculate_trading_profit
+    sma14: np.ndarray = None
+    
+    def __len__(self):
+        return len(self.rate)
+
+def _today_iso():
+    """Today's date as YYYY-MM-DD, recomputed at most once per TODAY_TTL seconds"""
+    global _TODAY
+    valid_until, today = _TODAY
+    now = time.monotonic()
+    if today is None or now >= valid_until:
+        today = datetime.now().date().isoformat()
+        _TODAY = (now + TODAY_TTL, today)
+    return today
+
+# --- 0. HTTP SESSION ---
+async def _hold_session(session):
+    """Keep `session` open for the life of its loop; close it when the loop cancels us on shutdown"""
+    try:
+        await asyncio.get_running_loop().create_future()
+    finally:
+        await session.close()
+
+def get_session():
+    """Return the shared aiohttp session, creating it on first use in the running loop"""
+    global SESSION, _SESSION_LOOP, _SESSION_KEEPER
+    loop = asyncio.get_running_loop()
+    if SESSION is None or SESSION.closed or _SESSION_LOOP is not loop:
+        if SESSION is not None and not SESSION.closed and not _SESSION_LOOP.is_closed():
+            # Close the previous session on the loop that owns its connections
+            _SESSION_LOOP.call_soon_threadsafe(_SESSION_KEEPER.cancel)
+        connector = aiohttp.TCPConnector(limit=POOL_MAXSIZE, limit_per_host=POOL_CONNECTIONS)
+        SESSION = aiohttp.ClientSession(connector=connector, headers={'Accept-Encoding': 'gzip'})
+        _SESSION_LOOP = loop
+        _SESSION_KEEPER = loop.create_task(_hold_session(SESSION))
+    return SESSION
+
+@atexit.register
+def close_session():
+    """Close the shared session at interpreter exit if its loop did not already do so"""
+    session, loop = SESSION, _SESSION_LOOP
+    if session is None or session.closed or loop.is_closed():
+        return
+    try:
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), loop).result(timeout=5)
+        else:
+            loop.run_until_complete(session.close())
+    except Exception as e:
+        print(f"Session close error: {e}")
+
+async def http_get(url, timeout=10, headers=None):
+    """
+    GET through the shared session, retrying connection errors, timeouts and
+    throttled/gateway statuses with backoff. `timeout` bounds all attempts together.
+    Returns (status, body bytes, response headers)
+    """
+    session = get_session()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    last_response = last_error = None
+    
+    for attempt in range(RETRY_TOTAL + 1):
+        if attempt:
+            delay = RETRY_BACKOFF * (2 ** (attempt - 1))
+            if loop.time() + delay >= deadline:
+                break
+            await asyncio.sleep(delay)
+        
+        try:
+            remaining = aiohttp.ClientTimeout(total=deadline - loop.time())
+            async with session.get(url, headers=headers, timeout=remaining) as response:
+                last_response = response.status, await response.read(), response.headers
+            last_error = None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            last_error = e
+            continue
+        
+        if last_response[0] not in RETRY_STATUSES:
+            return last_response
+    
+    if last_error is not None:
+        raise last_error
+    return last_response
+
+async def conditional_get(url, parse, timeout=10, key=None):
+    """
+    GET with If-None-Match / If-Modified-Since from the previous response.
+    On 304 the previously parsed payload is returned without touching the body;
+    on 200 the body is parsed with `parse` and remembered. Returns None otherwise.
+    Validators are stored under `key` (default: the URL) and only reused while
+    the URL is unchanged.
+    """
+    key = key or url
+    with _TTL_LOCK:
+        cached_url, etag, last_modified, cached = _VALIDATORS.get(key, (None, None, None, None))
+    if cached_url != url:
+        etag = last_modified = cached = None
+    
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+    
+    status, body, response_headers = await http_get(url, timeout=timeout, headers=headers)
+    
+    if status == 304 and cached is not None:
+        return cached
+    
+    if status == 200:
+        payload = parse(body)
+        etag, last_modified = response_headers.get('ETag'), response_headers.get('Last-Modified')
+        if etag or last_modified:
+            with _TTL_LOCK:
+                _VALIDATORS[key] = (url, etag, last_modified, payload)
+        return payload
+    
+    return None
+
+def ttl_cache(ttl, stale_ttl=STALE_TTL):
+    """
+    Cache an async fetcher's result in-process for `ttl` seconds.
+    The fetcher returns a tuple whose first item is None on failure and whose
+    last item is the status message. If a refetch fails while an older copy is
+    still within `stale_ttl`, that copy is returned with the message tagged stale.
+    The wrapped call returns (result, origin, fetched_at): origin is "network",
+    "cache" or "stale" (None on failure), fetched_at the wall-clock fetch time.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            with _TTL_LOCK:
+                entry = _TTL_CACHE.get(key)
+            if entry and now < entry[1]:
+                return entry[0], "cache", entry[3]
+            
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                print(f"{func.__name__} error: {e}")
+                result = None
+            
+            if result is not None and result[0] is not None:
+                fetched_at = datetime.now()
+                with _TTL_LOCK:
+                    _TTL_CACHE[key] = (result, now + ttl, now + stale_ttl, fetched_at)
+                return result, "network", fetched_at
+            
+            if entry and now < entry[2]:
+                value = entry[0]
+                return (*value[:-1], f"{value[-1]} (⚠️ stale)"), "stale", entry[3]
+            return result, None, None
+        return wrapper
+    return decorator
 
 # --- 1. ACCURATE DATA FETCHER WITH MULTIPLE SOURCES ---
-def fetch_from_bank_of_israel():
+def parse_boi_usd(body):
+    """Stream-parse the Bank of Israel XML and stop as soon as USD is found"""
+    for _, currency in etree.iterparse(io.BytesIO(body), events=('end',), tag='CURRENCY'):
+        if currency.findtext('CURRENCYCODE') == 'USD':
+            return float(currency.findtext('RATE')), currency.findtext('LAST_UPDATE')
+        currency.clear()
+    return None
+
+async def fetch_from_bank_of_israel():
     """
     Fetch from Bank of Israel official API (Most authoritative for ILS)
     """
     try:
         # Bank of Israel API - official source
-        url = "https://www.boi.org.il/PublicApi/GetExchangeRates"
-        response = requests.get(url, timeout=10)
+        usd = await conditional_get(BOI_URL, parse_boi_usd, timeout=10)
         
-        if response.status_code == 200:
-            # Parse XML response
-            root = ET.fromstring(response.content)
-            
-            # Find USD rate
-            for currency in root.findall('.//CURRENCY'):
-                code = currency.find('CURRENCYCODE')
-                rate = currency.find('RATE')
-                date = currency.find('LAST_UPDATE')
-                
-                if code is not None and code.text == 'USD':
-                    usd_rate = float(rate.text)
-                    rate_date = date.text if date is not None else datetime.now().strftime("%Y-%m-%d")
-                    return usd_rate, rate_date, "Bank of Israel"
+        if usd is not None:
+            usd_rate, rate_date = usd
+            return usd_rate, rate_date or _today_iso(), "Bank of Israel"
         
         return None, None, None
     except Exception as e:
         print(f"Bank of Israel API error: {e}")
         return None, None, None
 
-def fetch_from_exchangerate_host():
+async def fetch_from_exchangerate_host():
     """
     Backup: Free exchangerate.host API (No key needed)
     """
     try:
         # This API is free and reliable
-        url = "https://api.exchangerate.host/latest?base=USD&symbols=ILS"
-        response = requests.get(url, timeout=10)
+        data = await conditional_get(HOST_LATEST_URL, orjson.loads, timeout=10)
         
-        if response.status_code == 200:
-            data = response.json()
+        if data is not None:
             if data.get('success') and 'ILS' in data.get('rates', {}):
                 rate = data['rates']['ILS']
-                date = data.get('date', datetime.now().strftime("%Y-%m-%d"))
-                return rate, date, "ExchangeRate.host"
+                rate_date = data.get('date') or _today_iso()
+                return rate, rate_date, "ExchangeRate.host"
         
         return None, None, None
     except Exception as e:
         print(f"ExchangeRate.host error: {e}")
         return None, None, None
 
-def fetch_from_exchangerate_api():
+async def fetch_from_exchangerate_api():
     """
     Backup 2: ExchangeRate-API (Free tier, no key for latest)
     """
     try:
-        url = "https://open.er-api.com/v6/latest/USD"
-        response = requests.get(url, timeout=10)
+        data = await conditional_get(ER_API_URL, orjson.loads, timeout=10)
         
-        if response.status_code == 200:
-            data = response.json()
+        if data is not None:
             if 'ILS' in data.get('rates', {}):
                 rate = data['rates']['ILS']
-                date = data.get('time_last_update_utc', '').split()[0] if 'time_last_update_utc' in data else datetime.now().strftime("%Y-%m-%d")
-                return rate, date, "ExchangeRate-API"
+                rate_date = data['time_last_update_utc'].split()[0] if 'time_last_update_utc' in data else _today_iso()
+                return rate, rate_date, "ExchangeRate-API"
         
         return None, None, None
     except Exception as e:
         print(f"ExchangeRate-API error: {e}")
         return None, None, None
 
-def fetch_historical_data(days=30):
+@ttl_cache(HISTORICAL_TTL)
+async def fetch_historical_data(days=30):
     """
     Fetch historical data using exchangerate.host (supports history)
     """
     try:
-        data = []
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
+        end_date = _today_iso()
+        start_date = (datetime.fromisoformat(end_date) - timedelta(days=days)).date().isoformat()
         
         # Use exchangerate.host for historical data
-        url = f"https://api.exchangerate.host/timeseries?start_date={start_date.strftime('%Y-%m-%d')}&end_date={end_date.strftime('%Y-%m-%d')}&base=USD&symbols=ILS"
-        response = requests.get(url, timeout=15)
+        url = HIST_URL.format(s=start_date, e=end_date)
+        hist_data = await conditional_get(url, orjson.loads, timeout=15, key=HIST_URL)
         
-        if response.status_code == 200:
-            hist_data = response.json()
-            
+        if hist_data is not None:
             if hist_data.get('success') and 'rates' in hist_data:
-                for date_str, rates in sorted(hist_data['rates'].items()):
-                    if 'ILS' in rates:
-                        data.append({
-                            "Date": date_str,
-                            "Rate": round(rates['ILS'], 4)
-                        })
+                items = sorted((date_str, rates['ILS']) for date_str, rates in hist_data['rates'].items() if 'ILS' in rates)
                 
-                if data:
-                    return pd.DataFrame(data), "Historical data (30 days)"
+                if items:
+                    # Build both columns in one shot instead of a dict per day
+                    dates, values = zip(*items)
+                    series = RateSeries(
+                        date=np.asarray(dates, dtype='datetime64[D]'),
+                        rate=np.round(np.asarray(values, dtype=np.float64), 4)
+                    )
+                    return series, "Historical data (30 days)"
         
         return None, None
     except Exception as e:
         print(f"Historical fetch error: {e}")
         return None, None
 
-def get_current_rate():
+@ttl_cache(CURRENT_RATE_TTL)
+async def get_current_rate():
     """
-    Try multiple sources in order of reliability
+    Query all sources concurrently, pick the best one that answered
     Priority: Bank of Israel > ExchangeRate.host > ExchangeRate-API
     """
-    # Try Bank of Israel first (most authoritative for ILS)
-    rate, date, source = fetch_from_bank_of_israel()
-    if rate:
-        return rate, date, f"✅ {source} (Official)"
-    
-    # Try exchangerate.host
-    rate, date, source = fetch_from_exchangerate_host()
-    if rate:
-        return rate, date, f"✅ {source}"
+    results = await asyncio.gather(
+        fetch_from_bank_of_israel(),
+        fetch_from_exchangerate_host(),
+        fetch_from_exchangerate_api(),
+        return_exceptions=True
+    )
     
-    # Try exchangerate-api
-    rate, date, source = fetch_from_exchangerate_api()
-    if rate:
-        return rate, date, f"✅ {source}"
+    for result in results:
+        if isinstance(result, BaseException):
+            continue
+        rate, date, source = result
+        if rate:
+            if source == "Bank of Israel":
+                # Bank of Israel is the most authoritative for ILS
+                return rate, date, f"✅ {source} (Official)"
+            return rate, date, f"✅ {source}"
     
     return None, None, "❌ All APIs unavailable"
 
-def fetch_real_exchange_rates(days=30):
+async def fetch_real_exchange_rates(days=30):
     """
     Main function to get real, accurate USD/ILS data
     """
     try:
-        # Get current rate from best source
-        current_rate, current_date, status_msg = get_current_rate()
+        # Current rate and history are independent - fetch them together
+        (rate_result, _, _), (hist_result, hist_origin, hist_fetched_at) = await asyncio.gather(
+            get_current_rate(),
+            fetch_historical_data(days)
+        )
+        current_rate, current_date, status_msg = rate_result
+        series, hist_msg = hist_result
         
-        # Get historical data
-        df, hist_msg = fetch_historical_data(days)
-        
-        if df is not None and not df.empty:
-            # Cache the data
-            cache_data = {
-                'timestamp': datetime.now().isoformat(),
-                'data': df.to_dict('records'),
-                'current_rate': current_rate if current_rate else df['Rate'].iloc[-1],
-                'current_date': current_date if current_date else df['Date'].iloc[-1]
-            }
-            with open(CACHE_FILE, 'w') as f:
-                json.dump(cache_data, f)
+        if series is not None and len(series):
+            if hist_origin == "stale":
+                status_msg = f"{status_msg} (⚠️ stale history from {hist_fetched_at:%Y-%m-%d %H:%M})"
+            
+            # Cache the data (only when the series was just downloaded): columnar series + small metadata sidecar
+            if hist_origin == "network":
+                cache_data = {
+                    'timestamp': hist_fetched_at.isoformat(),
+                    'current_rate': current_rate if current_rate else series.rate[-1],
+                    'current_date': current_date if current_date else str(series.date[-1])
+                }
+                EXECUTOR.submit(_write_cache, series.date.copy(), series.rate.copy(), cache_data)
             
-            actual_current = current_rate if current_rate else df['Rate'].iloc[-1]
-            return df, actual_current, status_msg
+            actual_current = current_rate if current_rate else series.rate[-1]
+            return series, actual_current, status_msg
         
         # If historical fetch failed, try cached data
         return load_cached_data()
@@ -167,16 +372,34 @@ def fetch_real_exchange_rates(days=30):
         print(f"Fetch error: {e}")
         return load_cached_data()
 
+def _write_cache(dates, rates, cache_data):
+    """Write the disk cache via temp files + os.replace so readers never see a half-written file"""
+    try:
+        import pandas as pd
+        pd.DataFrame({'Date': dates, 'Rate': rates}).to_feather(CACHE_DATA_FILE + ".tmp")
+        os.replace(CACHE_DATA_FILE + ".tmp", CACHE_DATA_FILE)
+        
+        with open(CACHE_FILE + ".tmp", 'wb') as f:
+            f.write(orjson.dumps(cache_data, option=orjson.OPT_SERIALIZE_NUMPY))
+        os.replace(CACHE_FILE + ".tmp", CACHE_FILE)
+    except Exception as e:
+        print(f"Cache write error: {e}")
+
 def load_cached_data():
     """Load cached data if APIs fail"""
-    if os.path.exists(CACHE_FILE):
+    if os.path.exists(CACHE_FILE) and os.path.exists(CACHE_DATA_FILE):
         try:
-            with open(CACHE_FILE, 'r') as f:
-                cache = json.load(f)
-                df = pd.DataFrame(cache['data'])
+            import pandas as pd
+            with open(CACHE_FILE, 'rb') as f:
+                cache = orjson.loads(f.read())
+                df = pd.read_feather(CACHE_DATA_FILE)
+                series = RateSeries(
+                    date=df['Date'].to_numpy().astype('datetime64[D]'),
+                    rate=df['Rate'].to_numpy(dtype=np.float64)
+                )
                 cache_time = datetime.fromisoformat(cache['timestamp'])
                 age = (datetime.now() - cache_time).total_seconds() / 3600
-                return df, cache['current_rate'], f"⚠️ Using cached data ({age:.1f} hours old)"
+                return series, cache['current_rate'], f"⚠️ Using cached data ({age:.1f} hours old)"
         except:
             pass
     
@@ -185,105 +408,140 @@ def load_cached_data():
 
 def generate_demo_data():
     """Generate realistic demo data as last resort (based on actual USD/ILS rates)"""
-    data = []
     base_rate = 3.09  # Current realistic rate
     start_date = datetime.now() - timedelta(days=30)
     
-    for i in range(30):
-        # Realistic small fluctuations
-        trend = 0.0005 * (i - 15)  # Slight trend
-        volatility = 0.01 * ((i % 5) - 2) / 2  # Small waves
-        
-        rate = round(base_rate + trend + volatility, 4)
-        date = (start_date + timedelta(days=i)).strftime("%Y-%m-%d")
-        data.append({"Date": date, "Rate": rate})
+    i = np.arange(30)
+    trend = 0.0005 * (i - 15)  # Slight trend
+    volatility = 0.01 * ((i % 5) - 2) / 2  # Small waves
     
-    df = pd.DataFrame(data)
-    current_rate = data[-1]['Rate']
-    return df, current_rate, "📊 Demo mode (realistic rates)"
+    series = RateSeries(
+        date=np.datetime64(start_date.date(), 'D') + i,
+        rate=np.round(base_rate + trend + volatility, 4)
+    )
+    current_rate = series.rate[-1]
+    return series, current_rate, "📊 Demo mode (realistic rates)"
 
 # --- 2. ADVANCED TRADING SIMULATION ---
-def calculate_trading_profit(df, initial_usd=1000):
+def moving_average(values, window):
     """
-    Enhanced trading simulation with Moving Average Crossover strategy
+    Trailing mean over `window` points in one np.convolve pass
+    (the first window-1 points average what is available, like min_periods=1)
+    """
+    # Summing offsets from the first value keeps flat stretches exactly flat
+    base = values[0]
+    sums = np.convolve(values - base, np.ones(window))[:len(values)]
+    count = np.minimum(np.arange(1, len(values) + 1), window)
+    return base + sums / count
+
+def _simulate(rates, sma7, sma14, initial_usd):
     """
+    Moving Average Crossover backtest over flat float64 arrays (compiled by get_simulate).
+    Returns (final_usd, trades, portfolio_value) where each trades row is
+    (day index, action flag: 1 = BUY / -1 = SELL, rate, amount_usd, amount_nis).
+    """
+    n = len(rates)
     usd_balance = initial_usd
-    nis_balance = 0
-    trades = []
-    portfolio_value = []
+    nis_balance = 0.0
+    trades = np.zeros((n, 5))
+    n_trades = 0
+    portfolio_value = np.empty(n)
     
-    # Calculate technical indicators
-    df['SMA_7'] = df['Rate'].rolling(window=7, min_periods=1).mean()
-    df['SMA_14'] = df['Rate'].rolling(window=14, min_periods=1).mean()
-    
-    for index, row in df.iterrows():
-        current_rate = row['Rate']
+    for i in range(n):
+        current_rate = rates[i]
         
-        # Moving Average Crossover Strategy
-        if index > 0:
-            prev_sma_7 = df.loc[index-1, 'SMA_7']
-            prev_sma_14 = df.loc[index-1, 'SMA_14']
-            
+        if i > 0:
             # BUY Signal: Short MA crosses above Long MA
-            if (row['SMA_7'] > row['SMA_14'] and 
-                prev_sma_7 <= prev_sma_14 and 
-                usd_balance > 0):
+            if sma7[i] > sma14[i] and sma7[i-1] <= sma14[i-1] and usd_balance > 0:
                 nis_balance = usd_balance * current_rate
-                trades.append({
-                    'date': row['Date'],
-                    'action': 'BUY',
-                    'rate': current_rate,
-                    'amount_usd': usd_balance,
-                    'amount_nis': nis_balance
-                })
-                usd_balance = 0
+                trades[n_trades, 0] = i
+                trades[n_trades, 1] = 1
+                trades[n_trades, 2] = current_rate
+                trades[n_trades, 3] = usd_balance
+                trades[n_trades, 4] = nis_balance
+                n_trades += 1
+                usd_balance = 0.0
             
             # SELL Signal: Short MA crosses below Long MA
-            elif (row['SMA_7'] < row['SMA_14'] and 
-                  prev_sma_7 >= prev_sma_14 and 
-                  nis_balance > 0):
+            elif sma7[i] < sma14[i] and sma7[i-1] >= sma14[i-1] and nis_balance > 0:
                 usd_balance = nis_balance / current_rate
-                trades.append({
-                    'date': row['Date'],
-                    'action': 'SELL',
-                    'rate': current_rate,
-                    'amount_nis': nis_balance,
-                    'amount_usd': usd_balance
-                })
-                nis_balance = 0
+                trades[n_trades, 0] = i
+                trades[n_trades, 1] = -1
+                trades[n_trades, 2] = current_rate
+                trades[n_trades, 3] = usd_balance
+                trades[n_trades, 4] = nis_balance
+                n_trades += 1
+                nis_balance = 0.0
         
         # Track portfolio value in USD
-        total_value_usd = usd_balance + (nis_balance / current_rate)
-        portfolio_value.append(total_value_usd)
+        portfolio_value[i] = usd_balance + nis_balance / current_rate
     
     # Final conversion to USD
-    final_usd = usd_balance + (nis_balance / df['Rate'].iloc[-1])
+    final_usd = usd_balance + nis_balance / rates[n - 1]
+    return final_usd, trades[:n_trades], portfolio_value
+
+_SIMULATE = None
+_SIMULATE_LOCK = threading.Lock()
+
+def get_simulate():
+    """Return _simulate JIT-compiled with Numba, importing numba and compiling (or loading the cache) on first use"""
+    global _SIMULATE
+    with _SIMULATE_LOCK:
+        if _SIMULATE is None:
+            from numba import njit
+            _SIMULATE = njit(cache=True)(_simulate)
+    return _SIMULATE
+
+def calculate_trading_profit(series, initial_usd=1000):
+    """
+    Enhanced trading simulation with Moving Average Crossover strategy
+    """
+    # Calculate technical indicators
+    rates = np.ascontiguousarray(series.rate, dtype=np.float64)
+    series.sma7 = moving_average(rates, 7)
+    series.sma14 = moving_average(rates, 14)
+    dates = np.datetime_as_string(series.date, unit='D')
+    
+    final_usd, trade_rows, portfolio_value = get_simulate()(rates, series.sma7, series.sma14, float(initial_usd))
+    
+    trades = []
+    for index, flag, rate, amount_usd, amount_nis in trade_rows:
+        index = int(index)
+        trades.append({
+            'index': index,
+            'date': str(dates[index]),
+            'action': 'BUY' if flag > 0 else 'SELL',
+            'rate': rate,
+            'amount_usd': amount_usd,
+            'amount_nis': amount_nis
+        })
+    
     profit_usd = final_usd - initial_usd
     profit_pct = (profit_usd / initial_usd) * 100
     
-    return profit_usd, profit_pct, trades, portfolio_value
+    return profit_usd, profit_pct, trades, portfolio_value.tolist()
 
 # --- 3. ENHANCED VISUALIZATION ---
-def plot_advanced_chart(df, trades, portfolio_value):
-    """Create professional multi-panel chart"""
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8), height_ratios=[2, 1])
+PROFIT_ZONE = {'alpha': 0.3, 'color': 'green'}
+LOSS_ZONE = {'alpha': 0.3, 'color': 'red'}
+
+def build_chart():
+    """Create the multi-panel figure and its static artists once; refreshes only swap data"""
+    # Imported here so matplotlib is only loaded when the first chart is drawn
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(12, 8))
+    ax1, ax2 = fig.subplots(2, 1, height_ratios=[2, 1])
+    ax1.xaxis_date()
+    ax2.xaxis_date()
     
     # Panel 1: Exchange Rate with Moving Averages
-    ax1.plot(df['Date'], df['Rate'], label='USD/ILS Rate', 
-             linewidth=2.5, color='#2E86AB', marker='o', markersize=4)
-    ax1.plot(df['Date'], df['SMA_7'], label='7-Day MA', 
-             linewidth=1.5, color='#A23B72', linestyle='--', alpha=0.8)
-    ax1.plot(df['Date'], df['SMA_14'], label='14-Day MA', 
-             linewidth=1.5, color='#F18F01', linestyle='--', alpha=0.8)
-    
-    # Mark buy/sell points
-    for trade in trades:
-        color = 'green' if trade['action'] == 'BUY' else 'red'
-        marker = '^' if trade['action'] == 'BUY' else 'v'
-        trade_idx = df[df['Date'] == trade['date']].index[0]
-        ax1.scatter(trade['date'], trade['rate'], 
-                   color=color, marker=marker, s=200, zorder=5,
-                   edgecolors='black', linewidths=1.5)
+    lines = {}
+    lines['Rate'], = ax1.plot([], [], label='USD/ILS Rate', 
+                              linewidth=2.5, color='#2E86AB', marker='o', markersize=4)
+    lines['SMA_7'], = ax1.plot([], [], label='7-Day MA', 
+                               linewidth=1.5, color='#A23B72', linestyle='--', alpha=0.8)
+    lines['SMA_14'], = ax1.plot([], [], label='14-Day MA', 
+                                linewidth=1.5, color='#F18F01', linestyle='--', alpha=0.8)
     
     ax1.set_title('USD/ILS Exchange Rate Analysis (REAL DATA)', fontsize=14, fontweight='bold', pad=15)
     ax1.set_ylabel('Exchange Rate (ILS per USD)', fontsize=10)
@@ -292,15 +550,12 @@ def plot_advanced_chart(df, trades, portfolio_value):
     ax1.tick_params(axis='x', rotation=45)
     
     # Panel 2: Portfolio Performance
-    ax2.plot(df['Date'], portfolio_value, label='Portfolio Value', 
-             linewidth=2.5, color='#06A77D', marker='o', markersize=4)
+    lines['Portfolio'], = ax2.plot([], [], label='Portfolio Value', 
+                                   linewidth=2.5, color='#06A77D', marker='o', markersize=4)
     ax2.axhline(y=1000, color='gray', linestyle=':', label='Initial Investment', alpha=0.7, linewidth=2)
-    ax2.fill_between(range(len(df)), 1000, portfolio_value, 
-                     where=[pv >= 1000 for pv in portfolio_value],
-                     alpha=0.3, color='green', label='Profit Zone')
-    ax2.fill_between(range(len(df)), 1000, portfolio_value, 
-                     where=[pv < 1000 for pv in portfolio_value],
-                     alpha=0.3, color='red', label='Loss Zone')
+    # Empty zones only provide the legend entries; real ones are added per refresh
+    ax2.fill_between([], [], **PROFIT_ZONE, label='Profit Zone')
+    ax2.fill_between([], [], **LOSS_ZONE, label='Loss Zone')
     
     ax2.set_title('Portfolio Performance', fontsize=12, fontweight='bold', pad=10)
     ax2.set_xlabel('Date', fontsize=10)
@@ -309,26 +564,84 @@ def plot_advanced_chart(df, trades, portfolio_value):
     ax2.legend(loc='upper left', fontsize=9)
     ax2.tick_params(axis='x', rotation=45)
     
-    plt.tight_layout()
+    # Lay out against a typical 30-day date range so the rotated tick labels fit
+    for ax in (ax1, ax2):
+        ax.set_xlim(datetime.now() - timedelta(days=30), datetime.now())
+    fig.tight_layout()
+    for ax in (ax1, ax2):
+        ax.set_autoscalex_on(True)
+    return fig, ax1, ax2, lines
+
+_CHART = None
+_CHART_LOCK = threading.Lock()
+_CHART_ARTISTS = []  # trade markers and profit/loss zones from the previous refresh
+
+def get_chart():
+    """Return (fig, ax1, ax2, lines), building the chart on first use"""
+    global _CHART
+    with _CHART_LOCK:
+        if _CHART is None:
+            _CHART = build_chart()
+    return _CHART
+
+def plot_advanced_chart(series, trades, portfolio_value):
+    """Update the professional multi-panel chart with fresh data"""
+    portfolio_value = np.asarray(portfolio_value)
+    fig, ax1, ax2, lines = get_chart()
+    
+    # Drop the per-refresh artists before adding new ones
+    while _CHART_ARTISTS:
+        _CHART_ARTISTS.pop().remove()
+    
+    # Panel 1: Exchange Rate with Moving Averages
+    lines['Rate'].set_data(series.date, series.rate)
+    lines['SMA_7'].set_data(series.date, series.sma7)
+    lines['SMA_14'].set_data(series.date, series.sma14)
+    
+    # Mark buy/sell points
+    for trade in trades:
+        color = 'green' if trade['action'] == 'BUY' else 'red'
+        marker = '^' if trade['action'] == 'BUY' else 'v'
+        _CHART_ARTISTS.append(ax1.scatter(series.date[trade['index']], trade['rate'], 
+                                          color=color, marker=marker, s=200, zorder=5,
+                                          edgecolors='black', linewidths=1.5))
+    
+    # Panel 2: Portfolio Performance
+    lines['Portfolio'].set_data(series.date, portfolio_value)
+    _CHART_ARTISTS.append(ax2.fill_between(series.date, 1000, portfolio_value, 
+                                           where=portfolio_value >= 1000,
+                                           **PROFIT_ZONE))
+    _CHART_ARTISTS.append(ax2.fill_between(series.date, 1000, portfolio_value, 
+                                           where=portfolio_value < 1000,
+                                           **LOSS_ZONE))
+    
+    for ax in (ax1, ax2):
+        ax.relim()
+        ax.autoscale_view()
+    
+    fig.canvas.draw_idle()
     return fig
 
 # --- 4. DASHBOARD LOGIC ---
-def refresh_dashboard():
+async def refresh_dashboard(progress=gr.Progress()):
     """Main function to update the dashboard with ACCURATE data"""
     # Fetch REAL data
-    df, current_rate, status_msg = fetch_real_exchange_rates(30)
+    progress(0.0, desc="Fetching live rates...")
+    series, current_rate, status_msg = await fetch_real_exchange_rates(30)
+    progress(0.3, desc="Fetched rates")
     
     # Calculate trading performance
-    profit_usd, profit_pct, trades, portfolio_value = calculate_trading_profit(df)
+    profit_usd, profit_pct, trades, portfolio_value = calculate_trading_profit(series)
+    progress(0.7, desc="Computed strategy")
     
     # Generate recommendation
-    latest_rate = df['Rate'].iloc[-1]
-    sma_7 = df['SMA_7'].iloc[-1]
-    sma_14 = df['SMA_14'].iloc[-1]
+    latest_rate = series.rate[-1]
+    sma_7 = series.sma7[-1]
+    sma_14 = series.sma14[-1]
     
     # Calculate 24h change if we have enough data
-    if len(df) >= 2:
-        change_24h = ((latest_rate - df['Rate'].iloc[-2]) / df['Rate'].iloc[-2] * 100)
+    if len(series) >= 2:
+        change_24h = ((latest_rate - series.rate[-2]) / series.rate[-2] * 100)
     else:
         change_24h = 0
     
@@ -344,17 +657,17 @@ def refresh_dashboard():
     report = f"""
     ## 📊 REAL USD/ILS FOREX ANALYTICS
     **Data Source:** {status_msg}
-    **Last Updated:** {df['Date'].iloc[-1]}
+    **Last Updated:** {series.date[-1]}
     
     ---
     
     ### 💹 Current Market Status
     - **Live Rate:** {current_rate:.4f} ILS per USD
-    - **Previous Close:** {df['Rate'].iloc[-2]:.4f}
+    - **Previous Close:** {series.rate[-2]:.4f}
     - **Daily Change:** {change_24h:+.2f}%
     - **7-Day Average:** {sma_7:.4f}
     - **14-Day Average:** {sma_14:.4f}
-    - **30-Day Range:** {df['Rate'].min():.4f} - {df['Rate'].max():.4f}
+    - **30-Day Range:** {series.rate.min():.4f} - {series.rate.max():.4f}
     
     ---
     
@@ -387,10 +700,18 @@ def refresh_dashboard():
         report += "\n- No trades executed (holding initial position)"
     
     # Generate chart
-    chart = plot_advanced_chart(df, trades, portfolio_value)
-    
-    # Create data table
-    table_data = df[['Date', 'Rate', 'SMA_7', 'SMA_14']].tail(10).to_dict('records')
+    chart = plot_advanced_chart(series, trades, portfolio_value)
+    
+    # Create data table (last 10 days)
+    table_data = [
+        {'Date': date, 'Rate': rate, 'SMA_7': sma7, 'SMA_14': sma14}
+        for date, rate, sma7, sma14 in zip(
+            np.datetime_as_string(series.date[-10:], unit='D').tolist(),
+            series.rate[-10:].tolist(),
+            series.sma7[-10:].tolist(),
+            series.sma14[-10:].tolist()
+        )
+    ]
     
     return report, chart, table_data
 
@@ -450,5 +771,11 @@ with gr.Blocks(theme=gr.themes.Soft(), css="""
     """)
 
 # --- 6. LAUNCH ---
+def _warm_up():
+    """Pay the first-click costs (Numba JIT/cache load, chart setup) in the background"""
+    calculate_trading_profit(generate_demo_data()[0])
+    get_chart()
+
 if __name__ == "__main__":
+    threading.Thread(target=_warm_up, daemon=True).start()
     demo.launch(share=True, server_name="0.0.0.0")